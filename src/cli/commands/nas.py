@@ -1,3 +1,4 @@
+from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict
 
@@ -7,8 +8,10 @@ from rich.table import Table
 from rich.tree import Tree
 
 from ...core.config import Config
+from ...core.filenames import extension_kinds
+from ...core.language import LanguageDetector
 from ...core.nas_client import NASClient
-from ...core.subtitle_matcher import SubtitleMatcher
+from ...core.subtitle_matcher import SubtitleMatcher, rename_batches
 from ...models.subtitle import SubtitleFile
 from ...models.video import VideoFile
 
@@ -327,28 +330,27 @@ def _load_and_validate_config(ctx):
     return config
 
 
+# Common language patterns, in priority order
+_LANGUAGE_PATTERNS = {
+    "zh-cn": [".zh.", ".chi.", ".chs.", ".chinese.", "chinese", ".中文.", ".简体."],
+    "zh-tw": [".cht.", ".繁体.", ".traditional."],
+    "en": [".en.", ".eng.", ".english.", "english"],
+    "ja": [".jp.", ".jpn.", ".japanese.", "japanese"],
+    "ko": [".ko.", ".kor.", ".korean.", "korean"],
+    "fr": [".fr.", ".fre.", ".french.", "french"],
+    "de": [".de.", ".ger.", ".german.", "german"],
+    "es": [".es.", ".spa.", ".spanish.", "spanish"],
+    "pt": [".pt.", ".por.", ".portuguese.", "portuguese"],
+    "ru": [".ru.", ".rus.", ".russian.", "russian"],
+}
+_LANGUAGE_DETECTOR = LanguageDetector(_LANGUAGE_PATTERNS)
+
+
 def _detect_language_from_filename(filename: str, config) -> str:
     """Detect language from subtitle filename"""
-    name = filename.lower()
-
-    # Common language patterns
-    language_patterns = {
-        "zh-cn": [".zh.", ".chi.", ".chs.", ".chinese.", "chinese", ".中文.", ".简体."],
-        "zh-tw": [".cht.", ".繁体.", ".traditional."],
-        "en": [".en.", ".eng.", ".english.", "english"],
-        "ja": [".jp.", ".jpn.", ".japanese.", "japanese"],
-        "ko": [".ko.", ".kor.", ".korean.", "korean"],
-        "fr": [".fr.", ".fre.", ".french.", "french"],
-        "de": [".de.", ".ger.", ".german.", "german"],
-        "es": [".es.", ".spa.", ".spanish.", "spanish"],
-        "pt": [".pt.", ".por.", ".portuguese.", "portuguese"],
-        "ru": [".ru.", ".rus.", ".russian.", "russian"],
-    }
-
-    # Check for language patterns in filename
-    for lang_code, patterns in language_patterns.items():
-        if any(pattern in name for pattern in patterns):
-            return lang_code
+    language = _LANGUAGE_DETECTOR.detect(filename.lower())
+    if language:
+        return language
 
     # If no pattern found, use first preferred language from config
     if config.subtitles.languages:
@@ -365,9 +367,10 @@ def _scan_directory_for_files(nas_client, path, config):
         raise click.Abort()
 
     all_entries = nas_client.list_directory(path)
-    video_extensions = set(config.scanning.video_extensions)
-    subtitle_extensions = {".srt", ".ass", ".ssa", ".vtt", ".sub"}
+    kinds = extension_kinds(tuple(config.scanning.video_extensions))
 
+    # Shared by every model built from this listing
+    scanned_at = datetime.now()
     video_files = []
     subtitle_files = []
 
@@ -375,25 +378,27 @@ def _scan_directory_for_files(nas_client, path, config):
         if entry.is_dir:
             continue
 
-        file_ext = Path(entry.name).suffix.lower()
-        if file_ext in video_extensions:
+        kind = kinds.get(entry.suffix_lower)
+        if kind == "video":
             video_file = VideoFile(
                 filename=entry.name,
                 file_path=entry.path,
                 file_size=entry.size,
                 nas_path=entry.path,
                 modified_time=entry.modified_time,
+                scanned_time=scanned_at,
             )
             video_files.append(video_file)
-        elif file_ext in subtitle_extensions:
+        elif kind == "subtitle":
             detected_language = _detect_language_from_filename(entry.name, config)
             subtitle_file = SubtitleFile(
                 filename=entry.name,
                 file_path=entry.path,
                 language=detected_language,
-                format=file_ext.lstrip("."),
+                format=entry.suffix_lower[1:],
                 video_filename="",
                 file_size=entry.size,
+                download_time=scanned_at,
             )
             subtitle_files.append(subtitle_file)
 
@@ -466,38 +471,40 @@ def _execute_rename_operations(rename_operations, config, path, force):
     """Execute rename operations and return results"""
     results = {"renamed": 0, "skipped": 0, "errors": 0}
 
-    with NASClient(config) as nas_client:
-        for operation in rename_operations:
-            if not operation.needs_rename:
-                results["skipped"] += 1
-                continue
+    pending = [operation for operation in rename_operations if operation.needs_rename]
+    results["skipped"] += len(rename_operations) - len(pending)
 
-            old_path = operation.subtitle_file.file_path
-            new_path = str(Path(path) / operation.new_name)
+    with NASClient(config) as nas_client:
+        # Batches run in order, so each existence check sees the renames before
+        # it, as in a one-by-one loop; within a batch no two share a name
+        for batch in rename_batches(pending):
+            to_rename = []
+            for operation in batch:
+                new_path = str(Path(path) / operation.new_name)
+                if not force and nas_client.path_exists(new_path):
+                    console.print(
+                        f"[yellow]Skipping {operation.new_name}: file exists[/yellow]"
+                    )
+                    results["skipped"] += 1
+                    continue
+                to_rename.append((operation, new_path))
 
-            if nas_client.path_exists(new_path) and not force:
-                console.print(
-                    f"[yellow]Skipping {operation.new_name}: file exists[/yellow]"
-                )
-                results["skipped"] += 1
-                continue
+            errors = nas_client.rename_batch(
+                [(op.subtitle_file.file_path, new_path) for op, new_path in to_rename]
+            )
 
-            try:
-                success = nas_client.rename_file(old_path, new_path)
-                if success:
+            for (operation, _), error in zip(to_rename, errors):
+                if error is None:
                     results["renamed"] += 1
                     console.print(
-                        f"[green]✓[/green] Renamed: {operation.old_name} → "
-                        f"{operation.new_name}"
+                        f"[green]✓[/green] Renamed: "
+                        f"{operation.old_name} → {operation.new_name}"
                     )
                 else:
                     results["errors"] += 1
                     console.print(
-                        f"[red]✗[/red] Failed to rename: {operation.old_name}"
+                        f"[red]✗[/red] Error renaming {operation.old_name}: {error}"
                     )
-            except Exception as e:
-                results["errors"] += 1
-                console.print(f"[red]✗[/red] Error renaming {operation.old_name}: {e}")
 
     return results
 
@@ -649,9 +656,9 @@ def upload(ctx, local_paths, nas_path, overwrite, dry_run):
         for local_path in local_paths:
             local = LocalPath(local_path)
             if local.is_file():
-                upload_items.append(("file", str(local)))
+                upload_items.append(("file", local))
             elif local.is_dir():
-                upload_items.append(("dir", str(local)))
+                upload_items.append(("dir", local))
 
         if not upload_items:
             console.print("[yellow]No valid files or directories to upload[/yellow]")
@@ -665,8 +672,7 @@ def upload(ctx, local_paths, nas_path, overwrite, dry_run):
         table.add_column("Size", justify="right")
 
         total_size = 0
-        for item_type, item_path in upload_items:
-            local = LocalPath(item_path)
+        for item_type, local in upload_items:
             if item_type == "file":
                 size = local.stat().st_size
                 total_size += size
@@ -692,25 +698,23 @@ def upload(ctx, local_paths, nas_path, overwrite, dry_run):
         stats = {"uploaded": 0, "failed": 0, "skipped": 0}
 
         with NASClient(config) as nas_client:
-            for item_type, item_path in upload_items:
+            for item_type, local in upload_items:
+                item_path = str(local)
                 try:
                     if item_type == "file":
-                        target = f"{nas_path.rstrip('/')}/{LocalPath(item_path).name}"
+                        target = f"{nas_path.rstrip('/')}/{local.name}"
 
                         # Check if file exists
                         if nas_client.path_exists(target) and not overwrite:
                             console.print(
-                                f"[yellow]Skipping {LocalPath(item_path).name}: "
-                                "file exists[/yellow]"
+                                f"[yellow]Skipping {local.name}: file exists[/yellow]"
                             )
                             stats["skipped"] += 1
                             continue
 
                         nas_client.upload_file(item_path, nas_path)
                         stats["uploaded"] += 1
-                        console.print(
-                            f"[green]✓[/green] Uploaded: {LocalPath(item_path).name}"
-                        )
+                        console.print(f"[green]✓[/green] Uploaded: {local.name}")
                     else:
                         dir_stats = nas_client.upload_directory(
                             item_path, nas_path, True
@@ -719,7 +723,7 @@ def upload(ctx, local_paths, nas_path, overwrite, dry_run):
                         stats["failed"] += dir_stats["failed"]
                         console.print(
                             f"[green]✓[/green] Uploaded directory: "
-                            f"{LocalPath(item_path).name} "
+                            f"{local.name} "
                             f"({dir_stats['uploaded']} files)"
                         )
 
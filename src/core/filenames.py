@@ -0,0 +1,20 @@
+from functools import lru_cache
+from typing import Dict, Tuple
+
+SUBTITLE_EXTENSIONS = frozenset({".srt", ".ass", ".ssa", ".vtt", ".sub"})
+
+
+def split_extension(filename: str) -> Tuple[str, str]:
+    """Split a bare filename into (stem, extension) like Path.stem/Path.suffix"""
+    dot = filename.rfind(".")
+    if 0 < dot < len(filename) - 1:
+        return filename[:dot], filename[dot + 1 :]
+    return filename, ""
+
+
+@lru_cache(maxsize=8)
+def extension_kinds(video_extensions: Tuple[str, ...]) -> Dict[str, str]:
+    """Map file extensions to "video" or "subtitle" (video wins on overlap)"""
+    kinds = dict.fromkeys(SUBTITLE_EXTENSIONS, "subtitle")
+    kinds.update(dict.fromkeys(video_extensions, "video"))
+    return kinds
@@ -0,0 +1,22 @@
+from datetime import datetime
+from functools import lru_cache
+from typing import Sequence
+
+SIZE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+
+
+def format_size(size: int, units: Sequence[str] = SIZE_UNITS) -> str:
+    """Human readable size like "1.5MB"; sizes past the last unit stay in it"""
+    if size == 0:
+        return "0B"
+
+    # Units are 1024 apart, so the bit length selects the unit directly
+    exponent = min((size.bit_length() - 1) // 10, len(units) - 1)
+    return f"{size / (1 << (10 * exponent)):.1f}{units[exponent]}"
+
+
+# Bound once at import; model to_dict/from_dict call these for every timestamp.
+# Timestamps from one scan batch repeat and datetimes are immutable, so parsed
+# values are shared; 4096 entries stay well under a megabyte.
+format_iso = datetime.isoformat
+parse_iso = lru_cache(maxsize=4096)(datetime.fromisoformat)
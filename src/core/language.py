@@ -0,0 +1,56 @@
+from typing import Dict, List, Optional
+
+
+def _is_dotted_marker(pattern: str) -> bool:
+    """Whether a marker is one word wrapped in dots (for example ".en.")"""
+    return (
+        len(pattern) > 2
+        and pattern[0] == pattern[-1] == "."
+        and "." not in pattern[1:-1]
+    )
+
+
+class LanguageDetector:
+    """Detects a subtitle's language from filename markers, in priority order"""
+
+    def __init__(self, patterns: Dict[str, List[str]]):
+        # patterns maps language code to its markers; earlier languages win
+        self._codes = tuple(patterns)
+
+        # A dotted marker like ".en." is present exactly when its word is an
+        # inner dot-separated token of the name, so those become one dict
+        # lookup per token. Bare words like "english" can occur anywhere and
+        # keep a substring test.
+        self._tokens = {
+            pattern[1:-1]: priority
+            for priority, markers in enumerate(patterns.values())
+            for pattern in markers
+            if _is_dotted_marker(pattern)
+        }
+        self._words = tuple(
+            (priority, pattern)
+            for priority, markers in enumerate(patterns.values())
+            for pattern in markers
+            if not _is_dotted_marker(pattern)
+        )
+
+    def detect(self, name_lower: str) -> Optional[str]:
+        """Language code for an already lowercased filename, None if unmarked"""
+        no_match = len(self._codes)
+        best = min(
+            (
+                self._tokens.get(token, no_match)
+                for token in name_lower.split(".")[1:-1]
+            ),
+            default=no_match,
+        )
+
+        # Only a higher-priority bare word can still change the answer
+        for priority, word in self._words:
+            if priority >= best:
+                break
+            if word in name_lower:
+                best = priority
+                break
+
+        return self._codes[best] if best < no_match else None
@@ -1,14 +1,41 @@
 import fnmatch
-from dataclasses import dataclass
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from operator import attrgetter
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
+from smb.base import NotConnectedError, SMBTimeout
+from smb.smb_structs import OperationFailure
 from smb.SMBConnection import SMBConnection
 
 from .config import Config
+from .filenames import split_extension
+from .formatting import format_size
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+
+# Errors meaning the SMB session itself is unusable, as opposed to a failed
+# operation (missing path, permission denied) on a healthy connection
+_CONNECTION_ERRORS = (ConnectionError, TimeoutError, NotConnectedError, SMBTimeout)
+
+
+def is_connection_error(exc: BaseException) -> bool:
+    """Whether an exception, or one it was raised from, is a connection failure"""
+    # NASClient re-raises most errors as OSError, so follow the chain
+    while exc is not None:
+        if isinstance(exc, _CONNECTION_ERRORS):
+            return True
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+
+@dataclass(slots=True)
 class FileEntry:
     """Represents a file or directory entry"""
 
@@ -17,19 +44,44 @@ class FileEntry:
     is_dir: bool
     size: int = 0
     modified_time: Optional[datetime] = None
+    # Lowercased extension including the dot, like Path(name).suffix.lower()
+    suffix_lower: str = field(init=False, repr=False)
+
+    def __post_init__(self):
+        extension = split_extension(self.name)[1]
+        self.suffix_lower = f".{extension.lower()}" if extension else ""
 
     @property
     def size_human(self) -> str:
         """Human readable file size"""
-        if self.size == 0:
-            return "0B"
-
-        size = float(self.size)
-        for unit in ["B", "KB", "MB", "GB", "TB"]:
-            if size < 1024.0:
-                return f"{size:.1f}{unit}"
-            size /= 1024.0
-        return f"{size:.1f}PB"
+        return format_size(self.size)
+
+
+def build_directory_tree(
+    entries: List[FileEntry], subtrees: Iterator[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Build one tree level from a listing; subtrees yields each directory's children"""
+    tree = {}
+    for entry in entries:
+        if entry.is_dir:
+            tree[entry.name] = {
+                "type": "directory",
+                "path": entry.path,
+                "children": next(subtrees),
+            }
+        else:
+            tree[entry.name] = {
+                "type": "file",
+                "path": entry.path,
+                "size": entry.size,
+                "modified": entry.modified_time,
+            }
+    return tree
+
+
+def directory_tree_error(path: str, exc: Exception) -> OSError:
+    """Error raised when a directory tree level cannot be built"""
+    return OSError(f"Failed to build tree for {path}: {exc}")
 
 
 class NASClient:
@@ -90,6 +142,16 @@ class NASClient:
         except Exception:
             return False
 
+    def is_alive(self) -> bool:
+        """Check that the current connection still answers (no reconnect)"""
+        if not self._connection:
+            return False
+        try:
+            self._connection.echo(b"caption-mate", timeout=5)
+            return True
+        except Exception:
+            return False
+
     def list_shares(self) -> List[str]:
         """List available shares on the NAS"""
         try:
@@ -150,8 +212,15 @@ class NASClient:
 
             share_name, dir_path = self._parse_path(path)
 
+            # Compile the glob once instead of resolving it for every entry
+            matches_pattern = (
+                re.compile(fnmatch.translate(os.path.normcase(pattern))).match
+                if pattern
+                else None
+            )
+
             try:
-                file_list = self._connection.listPath(share_name, dir_path)
+                file_list = self._list_path(share_name, dir_path, pattern)
                 entries = []
 
                 for file_info in file_list:
@@ -159,7 +228,9 @@ class NASClient:
                     if file_info.filename in [".", ".."]:
                         continue
 
-                    if pattern and not fnmatch.fnmatch(file_info.filename, pattern):
+                    if matches_pattern and not matches_pattern(
+                        os.path.normcase(file_info.filename)
+                    ):
                         continue
 
                     is_dir = file_info.isDirectory
@@ -186,6 +257,23 @@ class NASClient:
         except Exception as e:
             raise OSError(f"Failed to access path {path}: {e}")
 
+    def _list_path(self, share_name: str, dir_path: str, pattern: Optional[str]):
+        """List a directory, letting the server pre-filter by pattern if it can"""
+        # SMB wildcards cover * and ? but not [...] sets; the server match is
+        # also case-insensitive, so callers still apply the exact glob
+        if pattern and "[" not in pattern:
+            try:
+                return self._connection.listPath(share_name, dir_path, pattern=pattern)
+            except OperationFailure:
+                # Some servers report "no such file" when nothing matches
+                logger.debug(
+                    "Pattern listing of %s failed; listing it in full",
+                    dir_path,
+                    exc_info=True,
+                )
+
+        return self._connection.listPath(share_name, dir_path)
+
     def get_directory_tree(
         self, path: str, max_depth: int = 3, current_depth: int = 0
     ) -> Dict[str, Any]:
@@ -195,30 +283,17 @@ class NASClient:
 
         try:
             entries = self.list_directory(path)
-            tree = {}
-
-            for entry in entries:
-                if entry.is_dir:
-                    subtree = self.get_directory_tree(
-                        entry.path, max_depth, current_depth + 1
-                    )
-                    tree[entry.name] = {
-                        "type": "directory",
-                        "path": entry.path,
-                        "children": subtree,
-                    }
-                else:
-                    tree[entry.name] = {
-                        "type": "file",
-                        "path": entry.path,
-                        "size": entry.size,
-                        "modified": entry.modified_time,
-                    }
-
-            return tree
+            return build_directory_tree(
+                entries,
+                (
+                    self.get_directory_tree(entry.path, max_depth, current_depth + 1)
+                    for entry in entries
+                    if entry.is_dir
+                ),
+            )
 
         except Exception as e:
-            raise OSError(f"Failed to build tree for {path}: {e}")
+            raise directory_tree_error(path, e)
 
     def path_exists(self, path: str) -> bool:
         """Check if path exists on NAS"""
@@ -282,7 +357,7 @@ class NASClient:
                 elif not entry.is_dir and should_include_file(entry.name):
                     video_files.append(entry)
 
-            return sorted(video_files, key=lambda x: x.path)
+            return sorted(video_files, key=attrgetter("path"))
 
         except Exception as e:
             raise OSError(f"Failed to scan video files in {path}: {e}")
@@ -308,6 +383,66 @@ class NASClient:
         except Exception as e:
             raise OSError(f"Failed to rename {old_path} to {new_path}: {e}")
 
+    def rename_batch(
+        self, pairs: List[Tuple[str, str]], max_workers: int = 4
+    ) -> List[Optional[Exception]]:
+        """Rename many files concurrently; returns None or the error per pair"""
+        results: List[Optional[Exception]] = [None] * len(pairs)
+        # SMB connections are not thread-safe, so each worker thread gets its
+        # own client; the first one reuses this client's connection
+        spare = [self]
+        opened: List[NASClient] = []
+        lock = threading.Lock()
+        local = threading.local()
+
+        def thread_client() -> Optional["NASClient"]:
+            if not hasattr(local, "client"):
+                with lock:
+                    client = spare.pop() if spare else None
+                if client is None:
+                    client = NASClient(self.config)
+                    try:
+                        client.connect()
+                    except Exception:
+                        logger.warning(
+                            "Extra NAS connection failed; its renames fall back "
+                            "to the main connection",
+                            exc_info=True,
+                        )
+                        client = None
+                    else:
+                        with lock:
+                            opened.append(client)
+                local.client = client
+            return local.client
+
+        def rename(i: int) -> bool:
+            """Rename pair i, or return False if this thread has no connection"""
+            client = thread_client()
+            if client is None:
+                return False
+            try:
+                client.rename_file(*pairs[i])
+            except Exception as e:
+                results[i] = e
+            return True
+
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+                attempted = list(executor.map(rename, range(len(pairs))))
+        finally:
+            for client in opened:
+                client.disconnect()
+
+        for i, done in enumerate(attempted):
+            if not done:
+                try:
+                    self.rename_file(*pairs[i])
+                except Exception as e:
+                    results[i] = e
+
+        return results
+
     def create_directory(self, path: str) -> bool:
         """Create a directory on the NAS"""
         try:
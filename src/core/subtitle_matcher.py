@@ -1,23 +1,77 @@
+import heapq
 import json
 import os
 import re
 from dataclasses import dataclass
-from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from operator import itemgetter
+from typing import Dict, List, Optional, Set, Tuple
 
-import jsonschema
-from langchain_openai import ChatOpenAI
-from langgraph.graph import END, StateGraph
 from typing_extensions import TypedDict
 
 from ..models.subtitle import SubtitleFile
 from ..models.video import VideoFile
+from .filenames import split_extension
+
+# Release tags stripped by normalize_filename; add new tags to the alternation
+# Examples: .HDTV, .WEB-DL, .BluRay, .x264, .h264
+_RELEASE_TAG_RE = re.compile(
+    r"\.(?:HDTV|WEB-DL|BluRay|BDRip|DVDRip|WEBRip|REMUX"
+    r"|x264|h264|x265|h265|HEVC|AVC"
+    r"|AAC|DTS|AC3|MP3|FLAC"
+    r"|1080p|720p|480p|4K|UHD)"
+    r"|\-(?:RARBG|YTS|ETRG|FGT|SPARKS|DIMENSION)",
+    re.IGNORECASE,
+)
+
+# Dots act as word separators in release names; whitespace is handled by split()
+_DOT_TO_SPACE = str.maketrans(".", " ")
+
+
+# Every name is compared against every candidate in its directory, so the
+# (pure) normalization result is memoized per filename
+@lru_cache(maxsize=4096)
+def _normalize_filename(filename: str) -> str:
+    """Normalize filename for matching by removing common patterns"""
+    # Remove file extension
+    name = split_extension(filename)[0]
+
+    # Remove common patterns in brackets and parentheses
+    # Examples: [1080p], (2023), [BluRay], (Director's Cut)
+    name = re.sub(r"\[.*?\]", "", name)
+    name = re.sub(r"\(.*?\)", "", name)
+
+    # Remove common release tags in a single pass
+    name = _RELEASE_TAG_RE.sub("", name)
+
+    # Clean up multiple spaces and dots
+    name = " ".join(name.translate(_DOT_TO_SPACE).split())
+
+    return name.lower()
+
+
+def _name_similarity(
+    norm1: str, words1: frozenset, norm2: str, words2: frozenset
+) -> float:
+    """Similarity of two normalized names given their precomputed word sets"""
+    # Exact match after normalization
+    if norm1 == norm2:
+        return 1.0
+
+    if not words1 or not words2:
+        return 0.0
+
+    # Jaccard similarity (intersection over union)
+    intersection = len(words1 & words2)
+    return intersection / (len(words1) + len(words2) - intersection)
 
 
 def _robust_json_parse(
     content: str, video_names: List[str]
 ) -> Dict[str, Optional[str]]:
     """Robust JSON parsing with multiple fallback strategies"""
+    # Only needed in AI mode, so defer the import cost until first use
+    import jsonschema
 
     # Define expected schema for validation
     schema = {
@@ -109,7 +163,7 @@ def _parse_partial_json(
     return matches
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MatchResult:
     """Result of matching a video file with subtitle files"""
 
@@ -135,7 +189,7 @@ class MatchResult:
             return "low"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RenameOperation:
     """Represents a subtitle file rename operation"""
 
@@ -151,6 +205,25 @@ class RenameOperation:
         return self.old_name != self.new_name
 
 
+def rename_batches(
+    operations: List[RenameOperation],
+) -> List[List[RenameOperation]]:
+    """Split renames into ordered batches in which no two share a name"""
+    # SMB names are case-insensitive. An operation touching a name already used
+    # in the current batch (a target another rename vacates, or a shared
+    # target) starts a new batch, so it only runs once the earlier one is done
+    batches: List[List[RenameOperation]] = []
+    batch_names: Set[str] = set()
+    for operation in operations:
+        names = {operation.old_name.lower(), operation.new_name.lower()}
+        if not batches or not batch_names.isdisjoint(names):
+            batches.append([])
+            batch_names = set()
+        batches[-1].append(operation)
+        batch_names |= names
+    return batches
+
+
 class SubtitleMatcher:
     """Matches subtitle files to video files using filename similarity"""
 
@@ -160,60 +233,44 @@ class SubtitleMatcher:
 
     def normalize_filename(self, filename: str) -> str:
         """Normalize filename for matching by removing common patterns"""
-        # Remove file extension
-        name = Path(filename).stem
-
-        # Remove common patterns in brackets and parentheses
-        # Examples: [1080p], (2023), [BluRay], (Director's Cut)
-        name = re.sub(r"\[.*?\]", "", name)
-        name = re.sub(r"\(.*?\)", "", name)
-
-        # Remove common release tags
-        # Examples: .HDTV, .WEB-DL, .BluRay, .x264, .h264
-        patterns = [
-            r"\.(?:HDTV|WEB-DL|BluRay|BDRip|DVDRip|WEBRip|REMUX)",
-            r"\.(?:x264|h264|x265|h265|HEVC|AVC)",
-            r"\.(?:AAC|DTS|AC3|MP3|FLAC)",
-            r"\.(?:1080p|720p|480p|4K|UHD)",
-            r"\-(?:RARBG|YTS|ETRG|FGT|SPARKS|DIMENSION)",
-        ]
-
-        for pattern in patterns:
-            name = re.sub(pattern, "", name, flags=re.IGNORECASE)
-
-        # Clean up multiple spaces and dots
-        name = re.sub(r"[.\s]+", " ", name)
-        name = name.strip()
-
-        return name.lower()
+        return _normalize_filename(filename)
 
     def calculate_similarity(self, name1: str, name2: str) -> float:
         """Calculate similarity between two normalized filenames"""
         norm1 = self.normalize_filename(name1)
         norm2 = self.normalize_filename(name2)
-
-        # Exact match after normalization
-        if norm1 == norm2:
-            return 1.0
-
-        # Simple word-based similarity
-        words1 = set(norm1.split())
-        words2 = set(norm2.split())
-
-        if not words1 or not words2:
-            return 0.0
-
-        # Jaccard similarity (intersection over union)
-        intersection = len(words1.intersection(words2))
-        union = len(words1.union(words2))
-
-        return intersection / union if union > 0 else 0.0
+        return _name_similarity(
+            norm1, frozenset(norm1.split()), norm2, frozenset(norm2.split())
+        )
 
     def find_best_match(
-        self, video_file: VideoFile, subtitle_files: List[SubtitleFile]
+        self,
+        video_file: VideoFile,
+        subtitle_files: List[SubtitleFile],
+        top_k: int = 5,
+    ) -> MatchResult:
+        """Find the best matching subtitle for a video file
+
+        Only the ``top_k`` highest scoring candidates are kept in
+        ``all_candidates``; the best match is tracked independently.
+        """
+        scored = [
+            (
+                subtitle,
+                self.calculate_similarity(video_file.filename, subtitle.filename),
+            )
+            for subtitle in subtitle_files
+        ]
+        return self._build_match_result(video_file, scored, top_k)
+
+    def _build_match_result(
+        self,
+        video_file: VideoFile,
+        scored: List[Tuple[SubtitleFile, float]],
+        top_k: int = 5,
     ) -> MatchResult:
-        """Find the best matching subtitle for a video file"""
-        if not subtitle_files:
+        """Pick the best of already scored (subtitle, similarity) candidates"""
+        if not scored:
             return MatchResult(
                 video_file=video_file,
                 matched_subtitle=None,
@@ -222,17 +279,14 @@ class SubtitleMatcher:
                 match_method="none",
             )
 
-        candidates = []
-        for subtitle in subtitle_files:
-            similarity = self.calculate_similarity(
-                video_file.filename, subtitle.filename
-            )
-            candidates.append((subtitle, similarity))
+        best_subtitle, best_score = scored[0][0], -1.0
+        for subtitle, similarity in scored:
+            if similarity > best_score:
+                best_subtitle, best_score = subtitle, similarity
 
-        # Sort by similarity score
-        candidates.sort(key=lambda x: x[1], reverse=True)
+        # Keep only the highest scoring candidates
+        candidates = heapq.nlargest(top_k, scored, key=itemgetter(1))
 
-        best_subtitle, best_score = candidates[0]
         match_method = "none"
 
         if best_score >= 0.95:
@@ -259,7 +313,7 @@ class SubtitleMatcher:
         self, video_filename: str, language: str, subtitle_extension: str
     ) -> str:
         """Generate proper subtitle filename for a video"""
-        video_stem = Path(video_filename).stem
+        video_stem, _ = split_extension(video_filename)
         return f"{video_stem}.{language}.{subtitle_extension}"
 
     def plan_rename_operations(
@@ -279,7 +333,7 @@ class SubtitleMatcher:
             new_filename = self.generate_subtitle_filename(
                 video.filename,
                 subtitle.language,
-                Path(subtitle.filename).suffix.lstrip("."),
+                split_extension(subtitle.filename)[1],
             )
 
             operation = RenameOperation(
@@ -300,17 +354,27 @@ class SubtitleMatcher:
         """Match all videos with available subtitles in a directory"""
         results = []
 
+        # Normalize and tokenize each subtitle name once, not once per video
+        subtitle_names = []
+        for sub in subtitle_files:
+            norm = self.normalize_filename(sub.filename)
+            subtitle_names.append((sub, norm, frozenset(norm.split())))
+
         for video in video_files:
-            # Find potential subtitle matches
-            # Filter subtitles that might belong to this video
-            candidates = [
-                sub
-                for sub in subtitle_files
-                if self.calculate_similarity(video.filename, sub.filename) > 0.1
-            ]
+            video_norm = self.normalize_filename(video.filename)
+            video_words = frozenset(video_norm.split())
 
-            match_result = self.find_best_match(video, candidates)
-            results.append(match_result)
+            # Score every pair once; the score both filters out subtitles that
+            # can't belong to this video and ranks the remaining candidates
+            scored = []
+            for sub, sub_norm, sub_words in subtitle_names:
+                similarity = _name_similarity(
+                    video_norm, video_words, sub_norm, sub_words
+                )
+                if similarity > 0.1:
+                    scored.append((sub, similarity))
+
+            results.append(self._build_match_result(video, scored))
 
         return results
 
@@ -340,6 +404,9 @@ class SubtitleMatcher:
         self, video_names: List[str], subtitle_names: List[str]
     ) -> Dict[str, Optional[str]]:
         """Magic function using deepseek-reasoner for batch matching"""
+        # Heavy AI dependencies are imported lazily so regex mode stays fast
+        from langchain_openai import ChatOpenAI
+        from langgraph.graph import END, StateGraph
 
         class MatchingState(TypedDict):
             video_names: List[str]
@@ -411,6 +478,14 @@ Rules:
         results = []
         subtitle_map = {s.filename: s for s in subtitle_files}
 
+        # Every AI-matched subtitle is a candidate for every video, so build
+        # the (read-only) candidate list once instead of once per video
+        candidates = [
+            (subtitle_map[name], 0.95)
+            for name in ai_matches.values()
+            if name and name in subtitle_map
+        ]
+
         for video in video_files:
             matched_subtitle_name = ai_matches.get(video.filename)
             matched_subtitle = None
@@ -422,12 +497,6 @@ Rules:
                 similarity_score = 0.95  # AI match assumed high confidence
                 match_method = "ai_semantic"
 
-            candidates = [
-                (subtitle_map[name], 0.95)
-                for name in ai_matches.values()
-                if name and name in subtitle_map
-            ]
-
             result = MatchResult(
                 video_file=video,
                 matched_subtitle=matched_subtitle,
@@ -1,14 +1,39 @@
+import os
+import re
 from dataclasses import dataclass
 from datetime import timedelta
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, Optional
 
 import ffmpeg
 
 from .config import Config
+from .formatting import format_size
 
+# Filename cleanup patterns used when extracting a title for matching
+_YEAR_RE = re.compile(r"[\(\[](?:19|20)\d{2}[\)\]]")
+_TAG_RE = re.compile(
+    r"\b(?:1080p|720p|480p|4K|HD|BluRay|BrRip|DVDRip|WEBRip|HDTV"
+    r"|x264|x265|HEVC|DivX|XviD"
+    r"|AAC|AC3|DTS|MP3"
+    r"|YIFY|RARBG|ETRG|SPARKS)\b",
+    re.IGNORECASE,
+)
+_SEPARATORS_TO_SPACE = str.maketrans("._-", "   ")
 
-@dataclass
+# Metadata extraction patterns
+_EPISODE_RE = re.compile(r"[Ss](\d+)[Ee](\d+)")
+_YEAR_VALUE_RE = re.compile(r"[\(\[]?(19|20)(\d{2})[\)\]]?")
+
+
+@lru_cache(maxsize=2048)
+def _probe(file_path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """Run ffprobe once per unchanged file (mtime and size are the cache key)"""
+    return ffmpeg.probe(file_path)
+
+
+@dataclass(slots=True)
 class VideoInfo:
     """Video file information"""
 
@@ -25,15 +50,7 @@ class VideoInfo:
     @property
     def size_human(self) -> str:
         """Human readable file size"""
-        if self.file_size == 0:
-            return "0B"
-
-        size = float(self.file_size)
-        for unit in ["B", "KB", "MB", "GB", "TB"]:
-            if size < 1024.0:
-                return f"{size:.1f}{unit}"
-            size /= 1024.0
-        return f"{size:.1f}PB"
+        return format_size(self.file_size)
 
     @property
     def duration_human(self) -> str:
@@ -78,8 +95,13 @@ class VideoAnalyzer:
         )
 
         try:
-            # Use ffprobe to get video metadata
-            probe = ffmpeg.probe(file_path)
+            # Use ffprobe to get video metadata, reusing results for unchanged files
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                probe = ffmpeg.probe(file_path)
+            else:
+                probe = _probe(file_path, st.st_mtime_ns, st.st_size)
 
             # Find video stream
             video_streams = [
@@ -149,6 +171,17 @@ class VideoAnalyzer:
         subtitle_formats = self.config.subtitles.formats
         languages = self.config.subtitles.languages
 
+        # List the directory once instead of stat-ing every candidate name;
+        # names are casefolded so "Movie.EN.srt" counts on case-insensitive
+        # filesystems just as Path.exists() did
+        try:
+            with os.scandir(video_dir) as it:
+                existing_files = {
+                    entry.name.casefold() for entry in it if not entry.is_dir()
+                }
+        except OSError:
+            existing_files = set()
+
         found_subtitles = {}
 
         for lang in languages:
@@ -163,8 +196,7 @@ class VideoAnalyzer:
                 ]
 
                 for pattern in patterns:
-                    subtitle_path = video_dir / pattern
-                    if subtitle_path.exists():
+                    if pattern.casefold() in existing_files:
                         found_subtitles[lang] = True
                         break
 
@@ -193,32 +225,21 @@ class VideoAnalyzer:
         }
 
         # Extract title from filename (remove common patterns)
-        import re
-
         filename_stem = Path(video_info.filename).stem
 
         # Remove year patterns
-        title = re.sub(r"[\(\[](?:19|20)\d{2}[\)\]]", "", filename_stem)
-
-        # Remove quality indicators and release group tags
-        quality_patterns = [
-            r"\b(?:1080p|720p|480p|4K|HD|BluRay|BrRip|DVDRip|WEBRip|HDTV)\b",
-            r"\b(?:x264|x265|HEVC|DivX|XviD)\b",
-            r"\b(?:AAC|AC3|DTS|MP3)\b",
-            r"\b(?:YIFY|RARBG|ETRG|SPARKS)\b",
-        ]
+        title = _YEAR_RE.sub("", filename_stem)
 
-        for pattern in quality_patterns:
-            title = re.sub(pattern, "", title, flags=re.IGNORECASE)
+        # Remove quality indicators and release group tags in a single pass
+        title = _TAG_RE.sub("", title)
 
         # Clean up separators and extra spaces
-        title = re.sub(r"[._-]+", " ", title)
-        title = re.sub(r"\s+", " ", title).strip()
+        title = " ".join(title.translate(_SEPARATORS_TO_SPACE).split())
 
         metadata["extracted_title"] = title
 
         # Extract season/episode info if it's a TV show
-        episode_match = re.search(r"[Ss](\d+)[Ee](\d+)", filename_stem)
+        episode_match = _EPISODE_RE.search(filename_stem)
         if episode_match:
             metadata["season"] = int(episode_match.group(1))
             metadata["episode"] = int(episode_match.group(2))
@@ -227,7 +248,7 @@ class VideoAnalyzer:
             metadata["is_tv_show"] = False
 
         # Extract year if present
-        year_match = re.search(r"[\(\[]?(19|20)(\d{2})[\)\]]?", filename_stem)
+        year_match = _YEAR_VALUE_RE.search(filename_stem)
         if year_match:
             metadata["year"] = int(year_match.group(1) + year_match.group(2))
 
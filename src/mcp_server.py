@@ -1,47 +1,189 @@
 """MCP Server for Caption-Mate NAS operations."""
 
-import json
-from pathlib import Path
-
+import asyncio
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+import orjson
 from mcp.server import Server
 from mcp.types import TextContent, Tool
 
 from .core.config import Config
-from .core.nas_client import NASClient
-from .core.subtitle_matcher import SubtitleMatcher
-from .models.subtitle import SubtitleFile
-from .models.video import VideoFile
+from .core.filenames import extension_kinds
+from .core.language import LanguageDetector
+from .core.nas_client import (
+    NASClient,
+    build_directory_tree,
+    directory_tree_error,
+    is_connection_error,
+)
+
+# The matcher and models are only needed by nas_match; they are imported there
+# so listing tools and server startup don't pay for them
+if TYPE_CHECKING:
+    from .core.subtitle_matcher import RenameOperation
 
 app = Server("caption-mate")
 
 
-def _load_config() -> Config:
-    """Load configuration from default location."""
+# (config file mtime_ns or None if missing, validated config)
+_config: Optional[Tuple[Optional[int], Config]] = None
+_config_lock = threading.Lock()
+
+
+def _config_mtime() -> Optional[int]:
+    """Modification time of the default config file, None if it is missing."""
     try:
-        config = Config.load(None)
-        errors = config.validate()
-        if errors:
-            raise ValueError(f"Configuration errors: {', '.join(errors)}")
+        return Config.get_default_config_path().stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _load_config() -> Config:
+    """Load configuration from default location, cached until the file changes."""
+    global _config
+
+    mtime = _config_mtime()
+
+    with _config_lock:
+        if _config is not None and _config[0] == mtime:
+            return _config[1]
+
+        try:
+            config = Config.load(None)
+            errors = config.validate()
+            if errors:
+                raise ValueError(f"Configuration errors: {', '.join(errors)}")
+        except Exception as e:
+            raise RuntimeError(f"Failed to load configuration: {e}")
+
+        _config = (mtime, config)
         return config
-    except Exception as e:
-        raise RuntimeError(f"Failed to load configuration: {e}")
 
 
-def _detect_language_from_filename(filename: str, config: Config) -> str:
-    """Detect language from subtitle filename."""
-    name = filename.lower()
+def _error(message: str) -> list[TextContent]:
+    """Tool response carrying a single error message."""
+    return [TextContent(type="text", text=_json({"error": message}))]
+
+
+def _json(obj: object) -> str:
+    """Serialize a tool result as compact JSON (datetimes become ISO strings)."""
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+# Idle connections kept open between tool calls, and how long one may sit idle
+# before it is probed with an SMB echo on reuse
+_NAS_POOL_SIZE = 4
+_NAS_IDLE_CHECK_SECONDS = 30.0
+
+
+class _NASClientPool:
+    """Connected NAS clients reused across tool calls."""
+
+    def __init__(self, config: Config):
+        self.config = config
+        self._idle: List[Tuple[NASClient, float]] = []
+        self._closed = False
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[NASClient]:
+        """Check out a connected client, returning it to the pool afterwards."""
+        # Liveness checks and connecting block on the network, so run off-loop
+        client = await asyncio.to_thread(self._checkout)
+        try:
+            yield client
+        except Exception as e:
+            # Operation errors (missing path, no permission) leave the
+            # connection usable; only a broken session is dropped
+            if is_connection_error(e):
+                await asyncio.to_thread(client.disconnect)
+            else:
+                await self._release(client)
+            raise
+        except BaseException:
+            # Cancelled mid-request: the session may still be busy or half-read
+            await asyncio.to_thread(client.disconnect)
+            raise
+        else:
+            await self._release(client)
 
-    language_patterns = {
-        "zh-cn": [".zh.", ".chi.", ".chs.", ".chinese.", "chinese", ".中文.", ".简体."],
-        "zh-tw": [".cht.", ".繁体.", ".traditional."],
-        "en": [".en.", ".eng.", ".english.", "english"],
-        "ja": [".jp.", ".jpn.", ".japanese.", "japanese"],
-        "ko": [".ko.", ".kor.", ".korean.", "korean"],
-    }
+    async def _release(self, client: NASClient) -> None:
+        if self._closed or len(self._idle) >= _NAS_POOL_SIZE:
+            await asyncio.to_thread(client.disconnect)
+        else:
+            self._idle.append((client, time.monotonic()))
 
-    for lang_code, patterns in language_patterns.items():
-        if any(pattern in name for pattern in patterns):
-            return lang_code
+    def _checkout(self) -> NASClient:
+        while True:
+            try:
+                client, released_at = self._idle.pop()
+            except IndexError:
+                break
+            idle_for = time.monotonic() - released_at
+            if idle_for < _NAS_IDLE_CHECK_SECONDS or client.is_alive():
+                return client
+            client.disconnect()
+
+        client = NASClient(self.config)
+        client.connect()
+        return client
+
+    async def close(self) -> None:
+        """Disconnect all idle clients."""
+        # Take the idle list on the loop so a concurrent release cannot refill it
+        self._closed = True
+        idle, self._idle = self._idle, []
+        for client, _ in idle:
+            await asyncio.to_thread(client.disconnect)
+
+
+_nas_pool: Optional[_NASClientPool] = None
+
+
+async def _nas_clients(config: Config) -> _NASClientPool:
+    """Get the client pool for the given config, replacing it after a reload."""
+    global _nas_pool
+
+    pool = _nas_pool
+    if pool is None or pool.config is not config:
+        # Install the new pool before awaiting so concurrent calls share it
+        _nas_pool = _NASClientPool(config)
+        if pool is not None:
+            await pool.close()
+    return _nas_pool
+
+
+# Language markers in priority order: the first language with any marker wins
+_LANGUAGE_PATTERNS = {
+    "zh-cn": [".zh.", ".chi.", ".chs.", ".chinese.", "chinese", ".中文.", ".简体."],
+    "zh-tw": [".cht.", ".繁体.", ".traditional."],
+    "en": [".en.", ".eng.", ".english.", "english"],
+    "ja": [".jp.", ".jpn.", ".japanese.", "japanese"],
+    "ko": [".ko.", ".kor.", ".korean.", "korean"],
+}
+_LANGUAGE_DETECTOR = LanguageDetector(_LANGUAGE_PATTERNS)
+
+
+def _detect_language_from_filename(name_lower: str, config: Config) -> str:
+    """Detect language from an already lowercased subtitle filename."""
+    language = _LANGUAGE_DETECTOR.detect(name_lower)
+    if language:
+        return language
 
     return config.subtitles.languages[0] if config.subtitles.languages else "zh-cn"
 
@@ -210,43 +352,33 @@ async def list_tools() -> list[Tool]:
 @app.call_tool()
 async def call_tool(name: str, arguments: dict) -> list[TextContent]:
     """Handle tool calls."""
+    handler = _TOOL_HANDLERS.get(name)
+    if handler is None:
+        return [TextContent(type="text", text=f"Unknown tool: {name}")]
+
     try:
-        if name == "nas_test":
-            return await _handle_nas_test()
-        elif name == "nas_ls":
-            return await _handle_nas_ls(arguments)
-        elif name == "nas_tree":
-            return await _handle_nas_tree(arguments)
-        elif name == "nas_scan":
-            return await _handle_nas_scan(arguments)
-        elif name == "nas_match":
-            return await _handle_nas_match(arguments)
-        elif name == "nas_upload":
-            return await _handle_nas_upload(arguments)
-        else:
-            return [TextContent(type="text", text=f"Unknown tool: {name}")]
+        return await handler(arguments)
     except Exception as e:
         return [TextContent(type="text", text=f"Error: {str(e)}")]
 
 
-async def _handle_nas_test() -> list[TextContent]:
+async def _handle_nas_test(arguments: dict) -> list[TextContent]:
     """Handle nas_test tool."""
     config = _load_config()
 
-    with NASClient(config) as client:
-        success = client.test_connection()
+    def run_test() -> dict:
+        with NASClient(config) as client:
+            if client.test_connection():
+                return {
+                    "status": "success",
+                    "message": "NAS connection successful",
+                    "shares": client.list_shares(),
+                }
+            return {"status": "failed", "message": "NAS connection failed"}
 
-        if success:
-            shares = client.list_shares()
-            result = {
-                "status": "success",
-                "message": "NAS connection successful",
-                "shares": shares,
-            }
-        else:
-            result = {"status": "failed", "message": "NAS connection failed"}
+    result = await asyncio.to_thread(run_test)
 
-    return [TextContent(type="text", text=json.dumps(result, indent=2))]
+    return [TextContent(type="text", text=_json(result))]
 
 
 async def _handle_nas_ls(arguments: dict) -> list[TextContent]:
@@ -257,43 +389,37 @@ async def _handle_nas_ls(arguments: dict) -> list[TextContent]:
 
     config = _load_config()
 
-    with NASClient(config) as client:
-        if not client.path_exists(path):
-            return [
-                TextContent(
-                    type="text",
-                    text=json.dumps({"error": f"Path does not exist: {path}"}),
-                )
-            ]
+    pool = await _nas_clients(config)
+    async with pool.acquire() as client:
+        if not await asyncio.to_thread(client.path_exists, path):
+            return _error(f"Path does not exist: {path}")
 
-        entries = client.list_directory(path, pattern)
+        entries = await asyncio.to_thread(client.list_directory, path, pattern)
 
-        result = {
-            "path": path,
-            "count": len(entries),
-            "entries": [],
-        }
-
-        for entry in entries:
-            entry_data = {
+    if long:
+        entries_data = [
+            {
                 "name": entry.name,
                 "type": "directory" if entry.is_dir else "file",
+                "size": entry.size,
+                "size_human": entry.size_human,
+                "modified": entry.modified_time,
             }
-            if long:
-                entry_data.update(
-                    {
-                        "size": entry.size,
-                        "size_human": entry.size_human,
-                        "modified": (
-                            entry.modified_time.isoformat()
-                            if entry.modified_time
-                            else None
-                        ),
-                    }
-                )
-            result["entries"].append(entry_data)
+            for entry in entries
+        ]
+    else:
+        entries_data = [
+            {"name": entry.name, "type": "directory" if entry.is_dir else "file"}
+            for entry in entries
+        ]
 
-    return [TextContent(type="text", text=json.dumps(result, indent=2))]
+    result = {
+        "path": path,
+        "count": len(entries),
+        "entries": entries_data,
+    }
+
+    return [TextContent(type="text", text=_json(result))]
 
 
 async def _handle_nas_tree(arguments: dict) -> list[TextContent]:
@@ -303,20 +429,56 @@ async def _handle_nas_tree(arguments: dict) -> list[TextContent]:
 
     config = _load_config()
 
-    with NASClient(config) as client:
-        if not client.path_exists(path):
-            return [
-                TextContent(
-                    type="text",
-                    text=json.dumps({"error": f"Path does not exist: {path}"}),
+    pool = await _nas_clients(config)
+
+    async with pool.acquire() as client:
+        if not await asyncio.to_thread(client.path_exists, path):
+            return _error(f"Path does not exist: {path}")
+
+    tree_data = await _directory_tree(
+        pool, path, depth, asyncio.Semaphore(_NAS_POOL_SIZE)
+    )
+
+    result = {"path": path, "depth": depth, "tree": tree_data}
+
+    return [TextContent(type="text", text=_json(result))]
+
+
+async def _directory_tree(
+    pool: _NASClientPool,
+    path: str,
+    max_depth: int,
+    limit: asyncio.Semaphore,
+    current_depth: int = 0,
+) -> dict:
+    """get_directory_tree with sibling directories listed concurrently."""
+    if current_depth >= max_depth:
+        return {}
+
+    try:
+        async with limit:
+            async with pool.acquire() as client:
+                entries = await asyncio.to_thread(client.list_directory, path)
+
+        # A failing subtree cancels its siblings, so no listing keeps running
+        # (and holding a pooled connection) after the error is reported
+        async with asyncio.TaskGroup() as group:
+            tasks = [
+                group.create_task(
+                    _directory_tree(
+                        pool, entry.path, max_depth, limit, current_depth + 1
+                    )
                 )
+                for entry in entries
+                if entry.is_dir
             ]
 
-        tree_data = client.get_directory_tree(path, max_depth=depth)
+        return build_directory_tree(entries, (task.result() for task in tasks))
 
-        result = {"path": path, "depth": depth, "tree": tree_data}
-
-    return [TextContent(type="text", text=json.dumps(result, indent=2))]
+    except Exception as e:
+        if isinstance(e, ExceptionGroup):
+            e = e.exceptions[0]
+        raise directory_tree_error(path, e)
 
 
 async def _handle_nas_scan(arguments: dict) -> list[TextContent]:
@@ -326,16 +488,12 @@ async def _handle_nas_scan(arguments: dict) -> list[TextContent]:
 
     config = _load_config()
 
-    with NASClient(config) as client:
-        if not client.path_exists(path):
-            return [
-                TextContent(
-                    type="text",
-                    text=json.dumps({"error": f"Path does not exist: {path}"}),
-                )
-            ]
+    pool = await _nas_clients(config)
+    async with pool.acquire() as client:
+        if not await asyncio.to_thread(client.path_exists, path):
+            return _error(f"Path does not exist: {path}")
 
-        video_files = client.scan_video_files(path, recursive)
+        video_files = await asyncio.to_thread(client.scan_video_files, path, recursive)
 
         result = {
             "path": path,
@@ -352,11 +510,15 @@ async def _handle_nas_scan(arguments: dict) -> list[TextContent]:
             ],
         }
 
-    return [TextContent(type="text", text=json.dumps(result, indent=2))]
+    return [TextContent(type="text", text=_json(result))]
 
 
 async def _handle_nas_match(arguments: dict) -> list[TextContent]:
     """Handle nas_match tool."""
+    from .core.subtitle_matcher import SubtitleMatcher
+    from .models.subtitle import SubtitleFile
+    from .models.video import VideoFile
+
     path = arguments["path"]
     mode = arguments.get("mode", "ai")
     threshold = arguments.get("threshold", 0.8)
@@ -365,64 +527,58 @@ async def _handle_nas_match(arguments: dict) -> list[TextContent]:
 
     config = _load_config()
 
-    with NASClient(config) as nas_client:
-        if not nas_client.path_exists(path):
-            return [
-                TextContent(
-                    type="text",
-                    text=json.dumps({"error": f"Path does not exist: {path}"}),
-                )
-            ]
+    pool = await _nas_clients(config)
+    async with pool.acquire() as nas_client:
+        if not await asyncio.to_thread(nas_client.path_exists, path):
+            return _error(f"Path does not exist: {path}")
 
         # Scan directory for files
-        all_entries = nas_client.list_directory(path)
-        video_extensions = set(config.scanning.video_extensions)
-        subtitle_extensions = {".srt", ".ass", ".ssa", ".vtt", ".sub"}
+        all_entries = await asyncio.to_thread(nas_client.list_directory, path)
+        kinds = extension_kinds(tuple(config.scanning.video_extensions))
 
+        # SMB names are case-insensitive; used to spot rename collisions
+        existing_names = set()
+        # One timestamp for the whole listing instead of a clock read per file
+        scanned_at = datetime.now()
         video_files = []
         subtitle_files = []
 
         for entry in all_entries:
+            # Lowercased once, for both the collision set and language detection
+            name_lower = entry.name.lower()
+            existing_names.add(name_lower)
             if entry.is_dir:
                 continue
 
-            file_ext = Path(entry.name).suffix.lower()
-            if file_ext in video_extensions:
+            kind = kinds.get(entry.suffix_lower)
+            if kind == "video":
                 video_file = VideoFile(
                     filename=entry.name,
                     file_path=entry.path,
                     file_size=entry.size,
                     nas_path=entry.path,
                     modified_time=entry.modified_time,
+                    scanned_time=scanned_at,
                 )
                 video_files.append(video_file)
-            elif file_ext in subtitle_extensions:
-                detected_language = _detect_language_from_filename(entry.name, config)
+            elif kind == "subtitle":
+                detected_language = _detect_language_from_filename(name_lower, config)
                 subtitle_file = SubtitleFile(
                     filename=entry.name,
                     file_path=entry.path,
                     language=detected_language,
-                    format=file_ext.lstrip("."),
+                    format=entry.suffix_lower[1:],
                     video_filename="",
                     file_size=entry.size,
+                    download_time=scanned_at,
                 )
                 subtitle_files.append(subtitle_file)
 
     if not video_files:
-        return [
-            TextContent(
-                type="text",
-                text=json.dumps({"error": "No video files found in directory"}),
-            )
-        ]
+        return _error("No video files found in directory")
 
     if not subtitle_files:
-        return [
-            TextContent(
-                type="text",
-                text=json.dumps({"error": "No subtitle files found in directory"}),
-            )
-        ]
+        return _error("No subtitle files found in directory")
 
     # Perform matching
     matcher = SubtitleMatcher(similarity_threshold=threshold, mode=mode)
@@ -435,12 +591,8 @@ async def _handle_nas_match(arguments: dict) -> list[TextContent]:
     successful_matches = [result for result in match_results if result.has_match]
 
     if not successful_matches:
-        return [
-            TextContent(
-                type="text",
-                text=json.dumps({"message": "No matches found above threshold"}),
-            )
-        ]
+        message = {"message": "No matches found above threshold"}
+        return [TextContent(type="text", text=_json(message))]
 
     rename_operations = matcher.plan_rename_operations(successful_matches, "")
 
@@ -451,93 +603,220 @@ async def _handle_nas_match(arguments: dict) -> list[TextContent]:
         "threshold": threshold,
         "dry_run": dry_run,
         "matches_found": len(rename_operations),
-        "matches": [],
     }
 
     if not dry_run:
         # Execute renames
-        renamed_count = 0
-        skipped_count = 0
-        error_count = 0
-
-        with NASClient(config) as nas_client:
-            for operation in rename_operations:
-                if not operation.needs_rename:
-                    skipped_count += 1
-                    continue
+        result["matches"], result["summary"] = await _execute_renames(
+            config, rename_operations, path, force, existing_names
+        )
+    else:
+        # Dry run - just show what would be done
+        result["matches"] = [
+            _rename_entry(operation, needs_rename=operation.needs_rename)
+            for operation in rename_operations
+        ]
+
+    return [TextContent(type="text", text=_json(result))]
+
+
+def _rename_entry(operation: "RenameOperation", **details) -> dict:
+    """Build the match report entry for a rename operation."""
+    return {
+        "video": operation.target_video.filename,
+        "old_subtitle": operation.old_name,
+        "new_subtitle": operation.new_name,
+        "confidence": operation.confidence,
+        **details,
+    }
+
 
-                old_path = operation.subtitle_file.file_path
-                new_path = str(Path(path) / operation.new_name)
+def _rename_subtitle(
+    nas_client: NASClient, operation: "RenameOperation", path_prefix: str
+) -> dict:
+    """Rename one matched subtitle, returning its entry for the match report."""
+    old_path = operation.subtitle_file.file_path
+    new_path = path_prefix + operation.new_name
+
+    try:
+        if nas_client.rename_file(old_path, new_path):
+            return _rename_entry(operation, status="renamed")
+        return _rename_entry(operation, status="error")
+    except Exception as e:
+        # A dead session is the worker's problem, not this rename's
+        if is_connection_error(e):
+            raise
+        return _rename_entry(operation, status="error", error=str(e))
+
+
+async def _execute_renames(
+    config: Config,
+    rename_operations: List["RenameOperation"],
+    path: str,
+    force: bool,
+    existing_names: Set[str],
+) -> Tuple[List[dict], dict]:
+    """Run the planned renames concurrently, one pooled connection per worker."""
+    from .core.subtitle_matcher import rename_batches
+
+    pending = [op for op in rename_operations if op.needs_rename]
+    entries: List[Optional[dict]] = [None] * len(pending)
+    pool = await _nas_clients(config)
+    # NAS paths are always "/"-separated, so plain concatenation is enough
+    path_prefix = path.rstrip("/") + "/"
+
+    async def worker(next_index: Iterator[int]) -> None:
+        # SMB connections are not thread-safe, so each worker owns one
+        async with pool.acquire() as nas_client:
+            for i in next_index:
+                operation = pending[i]
+                # Checked against the listing instead of a path_exists round trip
+                new_key = operation.new_name.lower()
+                if new_key in existing_names and not force:
+                    entries[i] = _rename_entry(
+                        operation, status="skipped", reason="file exists"
+                    )
+                    continue
 
                 try:
-                    if nas_client.path_exists(new_path) and not force:
-                        skipped_count += 1
-                        result["matches"].append(
-                            {
-                                "video": operation.target_video.filename,
-                                "old_subtitle": operation.old_name,
-                                "new_subtitle": operation.new_name,
-                                "confidence": operation.confidence,
-                                "status": "skipped",
-                                "reason": "file exists",
-                            }
-                        )
-                    else:
-                        success = nas_client.rename_file(old_path, new_path)
-                        if success:
-                            renamed_count += 1
-                            result["matches"].append(
-                                {
-                                    "video": operation.target_video.filename,
-                                    "old_subtitle": operation.old_name,
-                                    "new_subtitle": operation.new_name,
-                                    "confidence": operation.confidence,
-                                    "status": "renamed",
-                                }
-                            )
-                        else:
-                            error_count += 1
-                            result["matches"].append(
-                                {
-                                    "video": operation.target_video.filename,
-                                    "old_subtitle": operation.old_name,
-                                    "new_subtitle": operation.new_name,
-                                    "confidence": operation.confidence,
-                                    "status": "error",
-                                }
-                            )
-                except Exception as e:
-                    error_count += 1
-                    result["matches"].append(
-                        {
-                            "video": operation.target_video.filename,
-                            "old_subtitle": operation.old_name,
-                            "new_subtitle": operation.new_name,
-                            "confidence": operation.confidence,
-                            "status": "error",
-                            "error": str(e),
-                        }
+                    entries[i] = await asyncio.to_thread(
+                        _rename_subtitle, nas_client, operation, path_prefix
                     )
+                except Exception as e:
+                    # Connection lost: report this rename, then let acquire()
+                    # drop the client; the other workers take the rest
+                    entries[i] = _rename_entry(operation, status="error", error=str(e))
+                    raise
+                if entries[i]["status"] == "renamed":
+                    existing_names.discard(operation.old_name.lower())
+                    existing_names.add(new_key)
+
+    # Batches run in order, so each check sees the renames before it, as in a
+    # one-by-one loop; within a batch no two operations share a name
+    start = 0
+    for batch in rename_batches(pending):
+        indices = range(start, start + len(batch))
+        start += len(batch)
+        next_index = iter(indices)
+        worker_count = min(_NAS_POOL_SIZE, len(batch))
+        failures = await asyncio.gather(
+            *(worker(next_index) for _ in range(worker_count)),
+            return_exceptions=True,
+        )
+
+        # Workers that could not connect leave their share to the others; only
+        # fail if some operations were never attempted
+        if any(entries[i] is None for i in indices):
+            raise next(f for f in failures if isinstance(f, BaseException))
+
+    summary = {
+        "renamed": 0,
+        "skipped": len(rename_operations) - len(pending),
+        "errors": 0,
+    }
+    for entry in entries:
+        status = entry["status"]
+        summary["errors" if status == "error" else status] += 1
+
+    return entries, summary
+
+
+def _count_files(root: str) -> int:
+    """Count files under a local directory without following directory symlinks."""
+    count = 0
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file():
+                        count += 1
+        except OSError:
+            continue
+    return count
+
+
+def _upload_item(
+    nas_client: NASClient, item: Tuple[str, str, str, int], nas_path: str
+) -> Tuple[Dict[str, int], dict]:
+    """Upload one local file or directory, returning its stats and report entry."""
+    item_type, item_path, item_name, item_info = item
+    try:
+        if item_type == "file":
+            nas_client.upload_file(item_path, nas_path)
+            return {"uploaded": 1}, {
+                "type": "file",
+                "name": item_name,
+                "size": item_info,
+                "target": f"{nas_path.rstrip('/')}/{item_name}",
+            }
 
-        result["summary"] = {
-            "renamed": renamed_count,
-            "skipped": skipped_count,
-            "errors": error_count,
+        dir_stats = nas_client.upload_directory(item_path, nas_path, True)
+        return {"uploaded": dir_stats["uploaded"], "failed": dir_stats["failed"]}, {
+            "type": "directory",
+            "name": item_name,
+            "files_count": item_info,
+            "uploaded": dir_stats["uploaded"],
         }
-    else:
-        # Dry run - just show what would be done
-        for operation in rename_operations:
-            result["matches"].append(
-                {
-                    "video": operation.target_video.filename,
-                    "old_subtitle": operation.old_name,
-                    "new_subtitle": operation.new_name,
-                    "confidence": operation.confidence,
-                    "needs_rename": operation.needs_rename,
-                }
-            )
+    except Exception as e:
+        # A dead session is the caller's problem, not this item's
+        if is_connection_error(e):
+            raise
+        return _upload_failure(item, e)
+
+
+def _upload_failure(
+    item: Tuple[str, str, str, int], error: Exception
+) -> Tuple[Dict[str, int], dict]:
+    """Stats and report entry for an item that failed to upload."""
+    return {"failed": 1}, {"type": item[0], "name": item[2], "error": str(error)}
+
+
+async def _upload_files(
+    pool: _NASClientPool,
+    upload_items: List[Tuple[str, str, str, int]],
+    indices: range,
+    nas_path: str,
+    overwrite: bool,
+    existing_names: Set[str],
+    outcomes: List[Optional[Tuple[Dict[str, int], Optional[dict]]]],
+) -> None:
+    """Upload a run of file items concurrently, one pooled connection per worker."""
+    next_index = iter(indices)
+
+    async def worker() -> None:
+        # SMB connections are not thread-safe, so each worker owns one
+        async with pool.acquire() as nas_client:
+            for i in next_index:
+                item = upload_items[i]
+                key = item[2].lower()
+                if key in existing_names and not overwrite:
+                    outcomes[i] = ({"skipped": 1}, None)
+                    continue
+                # Claim the name so a later file with the same name is skipped,
+                # as it was when uploads ran in order
+                existing_names.add(key)
+                try:
+                    outcomes[i] = await asyncio.to_thread(
+                        _upload_item, nas_client, item, nas_path
+                    )
+                except Exception as e:
+                    # Connection lost: report this item, then let acquire()
+                    # drop the client; the other workers take the rest
+                    outcomes[i] = _upload_failure(item, e)
+                    raise
 
-    return [TextContent(type="text", text=json.dumps(result, indent=2))]
+    worker_count = min(_NAS_POOL_SIZE, len(indices))
+    failures = await asyncio.gather(
+        *(worker() for _ in range(worker_count)), return_exceptions=True
+    )
+
+    # Workers that could not connect leave their share to the others; only
+    # fail if some items were never attempted
+    if any(outcomes[i] is None for i in indices):
+        raise next(f for f in failures if isinstance(f, BaseException))
 
 
 async def _handle_nas_upload(arguments: dict) -> list[TextContent]:
@@ -555,83 +834,73 @@ async def _handle_nas_upload(arguments: dict) -> list[TextContent]:
     for local_path in local_paths:
         local = LocalPath(local_path)
         if not local.exists():
-            return [
-                TextContent(
-                    type="text",
-                    text=json.dumps({"error": f"Local path not found: {local_path}"}),
-                )
-            ]
+            return _error(f"Local path not found: {local_path}")
         if local.is_file():
             upload_items.append(("file", str(local), local.name, local.stat().st_size))
         elif local.is_dir():
-            file_count = sum(1 for _ in local.rglob("*") if _.is_file())
+            file_count = await asyncio.to_thread(_count_files, str(local))
             upload_items.append(("dir", str(local), local.name, file_count))
 
     if not upload_items:
-        return [
-            TextContent(
-                type="text", text=json.dumps({"error": "No valid items to upload"})
-            )
-        ]
+        return _error("No valid items to upload")
+
+    pool = await _nas_clients(config)
 
-    # Ensure NAS directory exists
-    with NASClient(config) as nas_client:
-        if not nas_client.path_exists(nas_path):
+    # Ensure NAS directory exists; files are checked against one listing of it
+    # instead of a path_exists round trip each
+    existing_names: Set[str] = set()
+    async with pool.acquire() as nas_client:
+        if not await asyncio.to_thread(nas_client.path_exists, nas_path):
             try:
-                nas_client.create_directory(nas_path)
+                await asyncio.to_thread(nas_client.create_directory, nas_path)
             except Exception as e:
-                return [
-                    TextContent(
-                        type="text",
-                        text=json.dumps(
-                            {"error": f"Failed to create NAS directory: {str(e)}"}
-                        ),
+                return _error(f"Failed to create NAS directory: {str(e)}")
+        elif not overwrite:
+            entries = await asyncio.to_thread(nas_client.list_directory, nas_path)
+            existing_names = {entry.name.lower() for entry in entries}
+
+    # Execute upload. Directory items write straight into nas_path, so they run
+    # one at a time in order; the file items between them upload concurrently
+    outcomes: List[Optional[Tuple[Dict[str, int], Optional[dict]]]]
+    outcomes = [None] * len(upload_items)
+    position = 0
+    while position < len(upload_items):
+        if upload_items[position][0] == "dir":
+            async with pool.acquire() as nas_client:
+                outcomes[position] = await asyncio.to_thread(
+                    _upload_item, nas_client, upload_items[position], nas_path
+                )
+                following = upload_items[position + 1 : position + 2]
+                if not overwrite and following and following[0][0] == "file":
+                    # The next files must see what this directory just wrote
+                    entries = await asyncio.to_thread(
+                        nas_client.list_directory, nas_path
                     )
-                ]
+                    existing_names = {entry.name.lower() for entry in entries}
+            position += 1
+            continue
+
+        end = position
+        while end < len(upload_items) and upload_items[end][0] == "file":
+            end += 1
+        await _upload_files(
+            pool,
+            upload_items,
+            range(position, end),
+            nas_path,
+            overwrite,
+            existing_names,
+            outcomes,
+        )
+        position = end
 
-    # Execute upload
     stats = {"uploaded": 0, "failed": 0, "skipped": 0}
     uploaded_files = []
-
-    with NASClient(config) as nas_client:
-        for item_type, item_path, item_name, item_info in upload_items:
-            try:
-                if item_type == "file":
-                    target = f"{nas_path.rstrip('/')}/{item_name}"
-
-                    # Check if exists
-                    if nas_client.path_exists(target) and not overwrite:
-                        stats["skipped"] += 1
-                        continue
-
-                    nas_client.upload_file(item_path, nas_path)
-                    stats["uploaded"] += 1
-                    uploaded_files.append(
-                        {
-                            "type": "file",
-                            "name": item_name,
-                            "size": item_info,
-                            "target": target,
-                        }
-                    )
-                else:  # directory
-                    dir_stats = nas_client.upload_directory(item_path, nas_path, True)
-                    stats["uploaded"] += dir_stats["uploaded"]
-                    stats["failed"] += dir_stats["failed"]
-                    uploaded_files.append(
-                        {
-                            "type": "directory",
-                            "name": item_name,
-                            "files_count": item_info,
-                            "uploaded": dir_stats["uploaded"],
-                        }
-                    )
-
-            except Exception as e:
-                stats["failed"] += 1
-                uploaded_files.append(
-                    {"type": item_type, "name": item_name, "error": str(e)}
-                )
+    for item_stats, entry in outcomes:
+        for key, count in item_stats.items():
+            stats[key] += count
+        if entry is not None:
+            uploaded_files.append(entry)
 
     result = {
         "nas_path": nas_path,
@@ -639,22 +908,34 @@ async def _handle_nas_upload(arguments: dict) -> list[TextContent]:
         "uploaded_items": uploaded_files,
     }
 
-    return [TextContent(type="text", text=json.dumps(result, indent=2))]
+    return [TextContent(type="text", text=_json(result))]
+
+
+_TOOL_HANDLERS: Dict[str, Callable[[dict], Awaitable[list[TextContent]]]] = {
+    "nas_test": _handle_nas_test,
+    "nas_ls": _handle_nas_ls,
+    "nas_tree": _handle_nas_tree,
+    "nas_scan": _handle_nas_scan,
+    "nas_match": _handle_nas_match,
+    "nas_upload": _handle_nas_upload,
+}
 
 
 def main():
     """Run the MCP server."""
-    import asyncio
-
     from mcp.server.stdio import stdio_server
 
     async def run():
-        async with stdio_server() as (read_stream, write_stream):
-            await app.run(
-                read_stream,
-                write_stream,
-                app.create_initialization_options(),
-            )
+        try:
+            async with stdio_server() as (read_stream, write_stream):
+                await app.run(
+                    read_stream,
+                    write_stream,
+                    app.create_initialization_options(),
+                )
+        finally:
+            if _nas_pool is not None:
+                await _nas_pool.close()
 
     asyncio.run(run())
 
@@ -1,9 +1,19 @@
+import sys
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, Dict, Optional
 
+from ..core.formatting import format_iso, format_size, parse_iso
 
-@dataclass
+# Subtitles never need more than MB
+_SUBTITLE_SIZE_UNITS = ("B", "KB", "MB")
+
+# Low-cardinality fields ("en", "srt", "opensubtitles"); interning lets every
+# loaded record share one string and makes equality checks an identity test
+_INTERNED_FIELDS = ("language", "format", "source")
+
+
+@dataclass(slots=True)
 class SubtitleFile:
     """Represents a subtitle file"""
 
@@ -30,15 +40,7 @@ class SubtitleFile:
     @property
     def size_human(self) -> str:
         """Human readable file size"""
-        if self.file_size == 0:
-            return "0B"
-
-        size = float(self.file_size)
-        for unit in ["B", "KB", "MB"]:
-            if size < 1024.0:
-                return f"{size:.1f}{unit}"
-            size /= 1024.0
-        return f"{size:.1f}MB"
+        return format_size(self.file_size, _SUBTITLE_SIZE_UNITS)
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization"""
@@ -50,7 +52,7 @@ class SubtitleFile:
             "video_filename": self.video_filename,
             "source": self.source,
             "source_id": self.source_id,
-            "download_time": self.download_time.isoformat()
+            "download_time": format_iso(self.download_time)
             if self.download_time
             else None,
             "file_size": self.file_size,
@@ -62,6 +64,10 @@ class SubtitleFile:
     def from_dict(cls, data: Dict[str, Any]) -> "SubtitleFile":
         """Create from dictionary"""
         if data.get("download_time"):
-            data["download_time"] = datetime.fromisoformat(data["download_time"])
+            data["download_time"] = parse_iso(data["download_time"])
+        for key in _INTERNED_FIELDS:
+            value = data.get(key)
+            if type(value) is str:
+                data[key] = sys.intern(value)
 
         return cls(**data)
@@ -1,10 +1,13 @@
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, field
 from datetime import datetime
-from pathlib import Path
 from typing import Any, Dict, Optional
 
+from ..core.filenames import split_extension
+from ..core.formatting import format_iso, format_size, parse_iso
 
-@dataclass
+
+@dataclass(slots=True)
 class VideoFile:
     """Represents a video file with its metadata"""
 
@@ -33,27 +36,16 @@ class VideoFile:
     is_tv_show: bool = False
 
     # Subtitle status
-    has_subtitles: Dict[str, bool] = None
+    has_subtitles: Dict[str, bool] = field(default_factory=dict)
 
     def __post_init__(self):
-        if self.has_subtitles is None:
-            self.has_subtitles = {}
-
         if self.scanned_time is None:
             self.scanned_time = datetime.now()
 
     @property
     def size_human(self) -> str:
         """Human readable file size"""
-        if self.file_size == 0:
-            return "0B"
-
-        size = float(self.file_size)
-        for unit in ["B", "KB", "MB", "GB", "TB"]:
-            if size < 1024.0:
-                return f"{size:.1f}{unit}"
-            size /= 1024.0
-        return f"{size:.1f}PB"
+        return format_size(self.file_size)
 
     @property
     def duration_human(self) -> str:
@@ -88,14 +80,12 @@ class VideoFile:
             else:
                 return self.extracted_title
         else:
-            return Path(self.filename).stem
+            return split_extension(self.filename)[0]
 
     def needs_subtitles(self, languages: list[str]) -> bool:
         """Check if video needs subtitles for any of the specified languages"""
-        for lang in languages:
-            if not self.has_subtitles.get(lang, False):
-                return True
-        return False
+        has_subtitles = self.has_subtitles
+        return any(not has_subtitles.get(lang, False) for lang in languages)
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization"""
@@ -110,10 +100,10 @@ class VideoFile:
             "codec": self.codec,
             "bitrate": self.bitrate,
             "fps": self.fps,
-            "modified_time": self.modified_time.isoformat()
+            "modified_time": format_iso(self.modified_time)
             if self.modified_time
             else None,
-            "scanned_time": self.scanned_time.isoformat()
+            "scanned_time": format_iso(self.scanned_time)
             if self.scanned_time
             else None,
             "extracted_title": self.extracted_title,
@@ -129,8 +119,11 @@ class VideoFile:
         """Create from dictionary"""
         # Handle datetime parsing
         if data.get("modified_time"):
-            data["modified_time"] = datetime.fromisoformat(data["modified_time"])
+            data["modified_time"] = parse_iso(data["modified_time"])
         if data.get("scanned_time"):
-            data["scanned_time"] = datetime.fromisoformat(data["scanned_time"])
+            data["scanned_time"] = parse_iso(data["scanned_time"])
+        # Only a handful of codecs exist; share one string per codec
+        if type(data.get("codec")) is str:
+            data["codec"] = sys.intern(data["codec"])
 
         return cls(**data)
@@ -1,6 +1,7 @@
 import re
 import subprocess
 import sys
+import threading
 from pathlib import Path
 
 # Add src to path for imports
@@ -8,15 +9,16 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from src.main import main as cli_main  # noqa: E402
 
+_MATCH_COUNT_RE = re.compile(r"Found (\d+) matches")
+
 
 def extract_match_count(output_lines):
     """从输出中提取匹配数量"""
     for line in output_lines:
-        if "Found" in line and "matches" in line:
-            # 解析 "Found 3 matches:" 这样的行
-            match = re.search(r"Found (\d+) matches", line)
-            if match:
-                return int(match.group(1))
+        # 解析 "Found 3 matches:" 这样的行
+        match = _MATCH_COUNT_RE.search(line)
+        if match:
+            return int(match.group(1))
     return 0
 
 
@@ -24,13 +26,14 @@ def detect_ai_errors(output_lines):
     """检测AI模式特有的错误"""
     errors = []
     for line in output_lines:
-        if "API" in line and "error" in line.lower():
+        lower = line.lower()
+        if "API" in line and "error" in lower:
             errors.append("API error detected")
-        elif "timeout" in line.lower() and "ai" in line.lower():
+        elif "timeout" in lower and "ai" in lower:
             errors.append("AI timeout error")
-        elif "deepseek" in line.lower() and "error" in line.lower():
+        elif "deepseek" in lower and "error" in lower:
             errors.append("DeepSeek API error")
-        elif "json" in line.lower() and "decode" in line.lower():
+        elif "json" in lower and "decode" in lower:
             errors.append("JSON parsing error")
     return errors
 
@@ -45,6 +48,41 @@ def test_match_click_ai():
     return test_match_click(mode="ai")
 
 
+def _run_streaming(cmd, timeout):
+    """边运行边打印命令输出，返回 (stdout 行列表, stderr, 返回码)"""
+    killed = threading.Event()
+
+    def kill():
+        killed.set()
+        process.kill()
+
+    with subprocess.Popen(
+        cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, bufsize=1
+    ) as process:
+        # stderr 在后台读取，避免子进程因管道写满而阻塞
+        stderr_parts = []
+        reader = threading.Thread(
+            target=lambda: stderr_parts.append(process.stderr.read())
+        )
+        reader.start()
+        timer = threading.Timer(timeout, kill)
+        timer.start()
+        try:
+            print("STDOUT:")
+            lines = []
+            for line in process.stdout:
+                print(line, end="")
+                lines.append(line)
+            returncode = process.wait()
+        finally:
+            timer.cancel()
+            reader.join()
+
+    if killed.is_set():
+        raise subprocess.TimeoutExpired(cmd, timeout)
+    return lines, "".join(stderr_parts), returncode
+
+
 def test_match_integration(mode="regex"):
     """通过subprocess调用真实命令 - 最真实的测试"""
     print(f"Running integration test (mode: {mode})...")
@@ -71,22 +109,21 @@ def test_match_integration(mode="regex"):
 
     try:
         timeout = 240 if mode == "ai" else 120
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+        lines, stderr, returncode = _run_streaming(cmd, timeout)
+        stdout = "".join(lines)
 
-        print(f"Return code: {result.returncode}")
-        print(f"STDOUT:\n{result.stdout}")
+        print(f"Return code: {returncode}")
 
-        if result.stderr:
-            print(f"STDERR:\n{result.stderr}")
+        if stderr:
+            print(f"STDERR:\n{stderr}")
 
         # 基本验证
-        if result.returncode == 0:
+        if returncode == 0:
             print("✓ Command executed successfully")
         else:
-            print(f"✗ Command failed with return code {result.returncode}")
+            print(f"✗ Command failed with return code {returncode}")
 
         # 解析输出
-        lines = result.stdout.split("\n")
         match_count = extract_match_count(lines)
 
         if match_count > 0:
@@ -98,10 +135,10 @@ def test_match_integration(mode="regex"):
         ai_errors = detect_ai_errors(lines) if mode == "ai" else []
 
         return {
-            "success": result.returncode == 0,
+            "success": returncode == 0,
             "match_count": match_count,
-            "output": result.stdout,
-            "error": result.stderr,
+            "output": stdout,
+            "error": stderr,
             "mode": mode,
             "ai_errors": ai_errors,
         }
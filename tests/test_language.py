@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+from src.cli.commands.nas import _LANGUAGE_PATTERNS
+from src.core.language import LanguageDetector
+
+
+def substring_scan(patterns, name_lower):
+    """原始实现：按优先级返回第一个在文件名中出现任意标记的语言"""
+    for code, markers in patterns.items():
+        if any(marker in name_lower for marker in markers):
+            return code
+    return None
+
+
+DETECTOR = LanguageDetector(_LANGUAGE_PATTERNS)
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "movie.en.srt",
+        "movie.eng.ass",
+        "movie.zh.en.srt",
+        "movie.en.zh.srt",
+        "movie.english.chs.srt",
+        "movie.englishsub.srt",
+        "movie_chinese_en.srt",
+        "movie.中文.srt",
+        "movie.繁体.ass",
+        ".en.srt",
+        "movie.en.",
+        "movie..en..srt",
+        "movie.srt",
+        "en",
+        "",
+    ],
+)
+def test_detect_matches_substring_scan(name):
+    """边界文件名：检测结果与原始子串扫描一致"""
+    name_lower = name.lower()
+    assert DETECTOR.detect(name_lower) == substring_scan(_LANGUAGE_PATTERNS, name_lower)
+
+
+def test_detect_matches_substring_scan_random():
+    """随机拼接的文件名：检测结果与原始子串扫描一致"""
+    rng = random.Random(0)
+    markers = [marker for group in _LANGUAGE_PATTERNS.values() for marker in group]
+    parts = markers + ["movie", "s01e02", "1080p", ".", "..", "_", "-", "x"]
+
+    for _ in range(5000):
+        name_lower = "".join(rng.choice(parts) for _ in range(rng.randint(0, 6)))
+        assert DETECTOR.detect(name_lower) == substring_scan(
+            _LANGUAGE_PATTERNS, name_lower
+        )
+
+
+def test_detect_custom_patterns():
+    """自定义优先级：先出现的语言优先，无标记时返回 None"""
+    patterns = {"a": [".aa."], "b": [".bb.", "bword"]}
+    detector = LanguageDetector(patterns)
+
+    assert detector.detect("x.bb.aa.srt") == "a"
+    assert detector.detect("x.bword.aa.srt") == "a"
+    assert detector.detect("x.bword.srt") == "b"
+    assert detector.detect("x.cc.srt") is None
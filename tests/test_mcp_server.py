@@ -0,0 +1,105 @@
+import json
+import os
+
+import pytest
+
+from src import mcp_server
+from src.core.config import Config
+from src.core.nas_client import FileEntry, NASClient
+
+NAS_PATH = "/share/subs"
+
+
+class FakeNASClient(NASClient):
+    """内存中的 NAS 目录：只记录 NAS_PATH 下的文件名"""
+
+    files = set()
+
+    def connect(self):
+        pass
+
+    def disconnect(self):
+        pass
+
+    def is_alive(self):
+        return True
+
+    def path_exists(self, path):
+        return path == NAS_PATH
+
+    def list_directory(self, path, pattern=None):
+        return [
+            FileEntry(name=name, path=f"{path}/{name}", is_dir=False)
+            for name in sorted(self.files)
+        ]
+
+    def upload_file(self, local_path, nas_path):
+        self.files.add(os.path.basename(local_path))
+        return True
+
+    def upload_directory(self, local_path, nas_path, recursive=True):
+        names = os.listdir(local_path)
+        self.files.update(names)
+        return {"uploaded": len(names), "skipped": 0, "failed": 0}
+
+
+@pytest.fixture
+def anyio_backend():
+    """服务器基于 asyncio（asyncio.to_thread / TaskGroup）"""
+    return "asyncio"
+
+
+@pytest.fixture
+def fake_nas(monkeypatch):
+    """用 FakeNASClient 替换连接池中的客户端，并使用默认配置"""
+    config = Config()
+    monkeypatch.setattr(FakeNASClient, "files", {"old.srt"})
+    monkeypatch.setattr(mcp_server, "NASClient", FakeNASClient)
+    monkeypatch.setattr(mcp_server, "_nas_pool", None)
+    monkeypatch.setattr(mcp_server, "_load_config", lambda: config)
+    return FakeNASClient
+
+
+@pytest.fixture
+def local_items(tmp_path):
+    """本地目录 pack/（含 a.srt、b.srt）之后是同名文件 a.srt，以及已存在的 old.srt"""
+    pack = tmp_path / "pack"
+    pack.mkdir()
+    (pack / "a.srt").write_text("pack a")
+    (pack / "b.srt").write_text("pack b")
+    loose = tmp_path / "loose"
+    loose.mkdir()
+    (loose / "a.srt").write_text("loose a")
+    (loose / "old.srt").write_text("loose old")
+    return [str(pack), str(loose / "a.srt"), str(loose / "old.srt")]
+
+
+async def _upload(local_paths, overwrite):
+    """调用 nas_upload 并解析返回的 JSON"""
+    response = await mcp_server._handle_nas_upload(
+        {"local_paths": local_paths, "nas_path": NAS_PATH, "overwrite": overwrite}
+    )
+    return json.loads(response[0].text)
+
+
+@pytest.mark.anyio
+async def test_upload_skips_names_written_by_earlier_directory(fake_nas, local_items):
+    """不覆盖时，目录上传写入的同名文件和已有文件都被跳过"""
+    result = await _upload(local_items, overwrite=False)
+
+    assert result["summary"] == {"uploaded": 2, "failed": 0, "skipped": 2}
+    assert [item["type"] for item in result["uploaded_items"]] == ["directory"]
+    assert fake_nas.files == {"a.srt", "b.srt", "old.srt"}
+
+
+@pytest.mark.anyio
+async def test_upload_overwrite_uploads_every_item(fake_nas, local_items):
+    """覆盖时，同名文件在目录之后照常上传"""
+    result = await _upload(local_items, overwrite=True)
+
+    assert result["summary"] == {"uploaded": 4, "failed": 0, "skipped": 0}
+    assert [item["type"] for item in result["uploaded_items"]] == [
+        "directory",
+        "file",
+        "file",
+    ]
@@ -0,0 +1,147 @@
+import logging
+import threading
+import time
+
+import pytest
+
+import src.core.nas_client as nas_client_module
+from src.cli.commands import nas as nas_commands
+from src.core.config import Config
+from src.core.nas_client import NASClient
+from src.core.subtitle_matcher import RenameOperation
+from src.models.subtitle import SubtitleFile
+from src.models.video import VideoFile
+
+
+class FakeNASClient(NASClient):
+    """内存中的 NAS：按小写文件名记录文件，不建立真实 SMB 连接"""
+
+    files = set()
+    renames = []
+    disconnected = []
+    refuse_connections = False
+    lock = threading.Lock()
+
+    def connect(self):
+        if FakeNASClient.refuse_connections:
+            raise ConnectionError("Failed to connect to NAS: refused")
+
+    def disconnect(self):
+        with self.lock:
+            self.disconnected.append(self)
+
+    def path_exists(self, path):
+        with self.lock:
+            return path.rsplit("/", 1)[-1].lower() in self.files
+
+    def rename_file(self, old_path, new_path):
+        old = old_path.rsplit("/", 1)[-1].lower()
+        new = new_path.rsplit("/", 1)[-1].lower()
+        # 模拟网络往返，让线程池的每个线程都分到重命名
+        time.sleep(0.01)
+        with self.lock:
+            if old not in self.files:
+                raise OSError(f"Failed to rename {old_path}: no such file")
+            if new in self.files:
+                raise OSError(f"Failed to rename {old_path}: {new_path} exists")
+            self.files.remove(old)
+            self.files.add(new)
+            self.renames.append((self, old, new))
+        return True
+
+
+@pytest.fixture
+def fake_nas(monkeypatch):
+    """用 FakeNASClient 替换 NASClient，并重置共享状态"""
+    monkeypatch.setattr(FakeNASClient, "files", set())
+    monkeypatch.setattr(FakeNASClient, "renames", [])
+    monkeypatch.setattr(FakeNASClient, "disconnected", [])
+    monkeypatch.setattr(FakeNASClient, "refuse_connections", False)
+    monkeypatch.setattr(nas_client_module, "NASClient", FakeNASClient)
+    monkeypatch.setattr(nas_commands, "NASClient", FakeNASClient)
+    return FakeNASClient
+
+
+def test_rename_batch_results_follow_input_order(fake_nas):
+    """每个结果对应同一位置的重命名；失败项返回异常"""
+    fake_nas.files.update(f"s{i}.srt" for i in range(8) if i != 3)
+    pairs = [(f"/share/d/s{i}.srt", f"/share/d/v{i}.srt") for i in range(8)]
+
+    main = FakeNASClient(Config())
+    results = main.rename_batch(pairs)
+
+    assert [error is None for error in results] == [i != 3 for i in range(8)]
+    assert isinstance(results[3], OSError)
+    assert fake_nas.files == {f"v{i}.srt" for i in range(8) if i != 3}
+    # 额外打开的连接在批处理结束时全部断开，主连接保持打开
+    extra = {client for client, _, _ in fake_nas.renames if client is not main}
+    assert extra
+    assert extra <= set(fake_nas.disconnected)
+    assert main not in fake_nas.disconnected
+
+
+def test_rename_batch_falls_back_to_main_connection(fake_nas, caplog):
+    """额外连接失败时，所有重命名都在主连接上完成并记录警告"""
+    fake_nas.files.update(f"s{i}.srt" for i in range(8))
+    fake_nas.refuse_connections = True
+    pairs = [(f"/share/d/s{i}.srt", f"/share/d/v{i}.srt") for i in range(8)]
+
+    main = FakeNASClient(Config())
+    with caplog.at_level(logging.WARNING, logger=nas_client_module.__name__):
+        results = main.rename_batch(pairs)
+
+    assert results == [None] * 8
+    assert fake_nas.files == {f"v{i}.srt" for i in range(8)}
+    assert {client for client, _, _ in fake_nas.renames} == {main}
+    assert "Extra NAS connection failed" in caplog.text
+
+
+def _rename_operation(old_name, new_name):
+    """构造目录 /share/d 下的一个重命名操作"""
+    subtitle = SubtitleFile(
+        filename=old_name,
+        file_path=f"/share/d/{old_name}",
+        language="en",
+        format="srt",
+        video_filename="",
+    )
+    video = VideoFile(
+        filename="movie.mkv", file_path="/share/d/movie.mkv", file_size=1, nas_path=""
+    )
+    return RenameOperation(subtitle, old_name, new_name, video, 1.0)
+
+
+def test_execute_renames_waits_for_vacated_target(fake_nas):
+    """目标名被前一个操作腾出时，按顺序执行两个重命名"""
+    fake_nas.files.update({"a.srt", "c.srt"})
+    operations = [
+        _rename_operation("a.srt", "b.srt"),
+        _rename_operation("c.srt", "a.srt"),
+    ]
+
+    results = nas_commands._execute_rename_operations(
+        operations, Config(), "/share/d", force=False
+    )
+
+    assert results == {"renamed": 2, "skipped": 0, "errors": 0}
+    assert fake_nas.files == {"a.srt", "b.srt"}
+    assert [(old, new) for _, old, new in fake_nas.renames] == [
+        ("a.srt", "b.srt"),
+        ("c.srt", "a.srt"),
+    ]
+
+
+def test_execute_renames_skips_target_not_yet_vacated(fake_nas):
+    """目标名在之后才被腾出时，和逐个执行一样跳过该操作"""
+    fake_nas.files.update({"a.srt", "c.srt"})
+    operations = [
+        _rename_operation("c.srt", "a.srt"),
+        _rename_operation("a.srt", "b.srt"),
+    ]
+
+    results = nas_commands._execute_rename_operations(
+        operations, Config(), "/share/d", force=False
+    )
+
+    assert results == {"renamed": 1, "skipped": 1, "errors": 0}
+    assert fake_nas.files == {"b.srt", "c.srt"}